@@ -1,6 +1,7 @@
 import os
 from typing import Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
@@ -14,6 +15,8 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+
 @dataclass
 class MetricInsight:
     metric_name: str
@@ -38,18 +41,26 @@ class OllamaAnalyzer:
         """
         self.model_name = model_name or os.getenv('OLLAMA_MODEL_NAME', 'mistral')
         self.base_url = base_url or os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+        # (connect, read) timeout in seconds; read applies between streamed chunks
+        self.timeout = (5.0, float(os.getenv('OLLAMA_TIMEOUT', 60)))
         
         # Optional OpenAI fallback
         self.openai_key = os.getenv('OPENAI_API_KEY')
         if self.openai_key:
             logger.info("OpenAI API key found, will use as fallback if Ollama is unavailable")
         
+        # Reuse keep-alive connections across analysis and text generation calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         self._check_model_availability()
         
     def _check_model_availability(self):
         """Check if the specified model is available in Ollama."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
             if response.status_code == 200:
                 available_models = [model['name'] for model in response.json()['models']]
                 if self.model_name not in available_models:
@@ -59,23 +70,46 @@ class OllamaAnalyzer:
         except Exception as e:
             logger.error(f"Error checking Ollama model availability: {e}")
     
-    def _generate_ollama_response(self, prompt: str) -> str:
-        """Generate response from Ollama model."""
+    def _generate_ollama_response(self, prompt: str, json_only: bool = False) -> str:
+        """Generate response from Ollama model.
+        
+        The response is streamed and accumulated as tokens arrive.
+        
+        Args:
+            prompt: Prompt to send to the model
+            json_only: Stop reading, and close the stream, as soon as the first
+                      top-level JSON object in the output is complete
+        """
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model_name,
                     "prompt": prompt,
-                    "stream": False
-                }
-            )
-            
-            if response.status_code == 200:
-                return response.json()['response']
-            else:
-                logger.error(f"Ollama API error: {response.status_code}")
-                return ""
+                    "stream": True
+                },
+                stream=True,
+                timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code}")
+                    return ""
+                
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get('response', '')
+                    parts.append(token)
+                    if chunk.get('done'):
+                        break
+                    # An object can only have completed on a closing brace
+                    if (json_only and '}' in token and
+                            self._decode_first_json_object(''.join(parts)) is not None):
+                        break
+                
+                return ''.join(parts)
                 
         except Exception as e:
             logger.error(f"Error generating Ollama response: {e}")
@@ -98,7 +132,7 @@ class OllamaAnalyzer:
             )
             
             # Get response from Ollama
-            response = self._generate_ollama_response(prompt)
+            response = self._generate_ollama_response(prompt, json_only=True)
             
             # Parse response into insights
             insights = self._parse_llm_response(response, current_metrics)
@@ -163,12 +197,8 @@ class OllamaAnalyzer:
         """Parse LLM response into MetricInsight objects."""
         try:
             # Try to find JSON in the response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                data = json.loads(json_str)
-                
+            data = self._decode_first_json_object(response)
+            if data is not None:
                 insights = []
                 for metric in data.get('metrics', []):
                     insight = MetricInsight(
@@ -191,30 +221,45 @@ class OllamaAnalyzer:
             logger.error(f"Error parsing LLM response: {e}")
             return self._generate_fallback_insights(current_metrics)
     
+    @staticmethod
+    def _decode_first_json_object(text: str) -> Optional[Dict]:
+        """Decode the first JSON object in text, ignoring anything after it.
+        
+        Returns:
+            The decoded object, or None if no complete object is present
+        """
+        start_idx = text.find('{')
+        if start_idx < 0:
+            return None
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start_idx)
+        except json.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
+    
     def _calculate_trends(self, data: pd.DataFrame) -> Dict[str, str]:
-        """Calculate trends for each metric over time."""
-        trends = {}
-        for column in data.columns:
-            if column == 'timestamp':
-                continue
-                
-            recent_data = data[column].tail(10)  # Last 10 points
-            if len(recent_data) < 2:
-                trends[column] = 'stable'
-                continue
-                
-            # Simple linear regression for trend
-            x = np.arange(len(recent_data))
-            slope, _ = np.polyfit(x, recent_data, 1)
-            
-            if abs(slope) < 0.01:  # Threshold for stability
-                trends[column] = 'stable'
-            elif slope > 0:
-                trends[column] = 'increasing'
-            else:
-                trends[column] = 'decreasing'
-                
-        return trends
+        """Calculate trends for each metric over time.
+        
+        The least-squares slope over the last 10 points is computed for all
+        numeric columns at once with the closed-form estimator
+        slope = sum((x - x_mean) * (y - y_mean)) / sum((x - x_mean)**2).
+        Columns whose slope is undefined (missing values) are reported stable.
+        """
+        recent_data = data.select_dtypes('number').tail(10)  # Last 10 points
+        if len(recent_data) < 2:
+            return {column: 'stable' for column in recent_data.columns}
+        
+        # Simple linear regression for trend
+        values = recent_data.to_numpy(dtype=float)
+        x_centered = np.arange(len(values)) - (len(values) - 1) / 2
+        slopes = x_centered @ (values - values.mean(axis=0)) / (x_centered ** 2).sum()
+        
+        trends = np.where(
+            ~(np.abs(slopes) >= 0.01),  # Threshold for stability; NaN counts as stable
+            'stable',
+            np.where(slopes > 0, 'increasing', 'decreasing')
+        )
+        return dict(zip(recent_data.columns, trends.tolist()))
     
     def generate_scientific_text(self, insights: List[MetricInsight]) -> str:
         """Generate scientific text from insights using Ollama."""
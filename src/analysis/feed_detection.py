@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
@@ -14,7 +14,16 @@ class FeedDetector:
         self.weight_threshold = weight_threshold
         self.time_window = time_window
         self.noise_filter = noise_filter
+        self.last_detection_time: Optional[np.datetime64] = None
+        # Last (timestamp, reactor weight, feed bottle weight) sample already
+        # scanned. Later calls only scan newer samples, diffing the first one
+        # against it, so overlapping polling windows are not re-scanned.
+        self._last_sample: Optional[Tuple[np.datetime64, float, float]] = None
+        
+    def reset(self):
+        """Forget detection state, e.g. before re-analyzing older data."""
         self.last_detection_time = None
+        self._last_sample = None
         
     def detect_feed_events(self, data: pd.DataFrame, feed_logger=None) -> List[Dict]:
         """Detect feed events from weight data changes.
@@ -34,63 +43,79 @@ class FeedDetector:
             logger.error("No timestamp column in data")
             return []
             
+        # Cast timestamps once for the whole window rather than per event
+        timestamp_series = pd.to_datetime(data['timestamp'])
+        timestamps = timestamp_series.to_numpy('datetime64[ns]')
+        reactor_weight = data['R1_Weight_Bal'].to_numpy(dtype=np.float64)
+        bottle_weight = data['R2_Weight_Bal'].to_numpy(dtype=np.float64)
+        
         # Ensure data is sorted by timestamp
-        data = data.sort_values('timestamp')
+        if not timestamp_series.is_monotonic_increasing:
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+            reactor_weight = reactor_weight[order]
+            bottle_weight = bottle_weight[order]
         
-        # Rename weight columns for consistency
-        data = data.rename(columns={
-            'R1_Weight_Bal': 'reactor_weight',
-            'R2_Weight_Bal': 'feed_bottle_weight'
-        })
+        # Only scan samples newer than those seen by previous calls
+        previous_reactor = previous_bottle = np.nan
+        if self._last_sample is not None:
+            last_time, previous_reactor, previous_bottle = self._last_sample
+            start = np.searchsorted(timestamps, last_time, side='right')
+            timestamps = timestamps[start:]
+            reactor_weight = reactor_weight[start:]
+            bottle_weight = bottle_weight[start:]
+            if len(timestamps) == 0:
+                return []
+        self._last_sample = (timestamps[-1], reactor_weight[-1], bottle_weight[-1])
         
         # Calculate weight changes
-        data['reactor_weight_change'] = data['reactor_weight'].diff()
-        data['feed_bottle_weight_change'] = data['feed_bottle_weight'].diff()
+        reactor_change = np.diff(reactor_weight, prepend=previous_reactor)
+        bottle_change = np.diff(bottle_weight, prepend=previous_bottle)
         
         # Apply noise filter
-        data.loc[abs(data['reactor_weight_change']) < self.noise_filter, 'reactor_weight_change'] = 0
-        data.loc[abs(data['feed_bottle_weight_change']) < self.noise_filter, 'feed_bottle_weight_change'] = 0
+        reactor_change[np.abs(reactor_change) < self.noise_filter] = 0
+        bottle_change[np.abs(bottle_change) < self.noise_filter] = 0
         
-        feed_events = []
+        # Find significant, opposite weight changes (reactor up, feed bottle down)
+        candidates = np.flatnonzero(
+            (reactor_change > self.weight_threshold) &
+            (bottle_change < -self.weight_threshold)
+        )
         
-        # Find significant weight changes
-        significant_changes = data[
-            (abs(data['reactor_weight_change']) > self.weight_threshold) &
-            (abs(data['feed_bottle_weight_change']) > self.weight_threshold)
+        # Skip candidates too close to the last detection. Only the few
+        # surviving candidates are visited, not every row of the window.
+        window = np.timedelta64(self.time_window, 's')
+        last_time = self.last_detection_time
+        detected = []
+        for i in candidates:
+            if last_time is not None and timestamps[i] - last_time < window:
+                continue
+            detected.append(i)
+            last_time = timestamps[i]
+        
+        feed_events = [
+            {
+                'timestamp': pd.Timestamp(timestamps[i]),
+                'feed_type': 'auto_detected',
+                'volume': abs(bottle_change[i]) / 1000,  # Assuming 1g = 1mL, convert to liters
+                'reactor_weight_change': reactor_change[i],
+                'feed_bottle_weight_change': bottle_change[i]
+            }
+            for i in detected
         ]
+        self.last_detection_time = last_time
         
-        for _, row in significant_changes.iterrows():
-            # Skip if too close to last detection
-            current_time = pd.to_datetime(row['timestamp'])
-            if (self.last_detection_time and 
-                (current_time - self.last_detection_time).total_seconds() < self.time_window):
-                continue
-                
-            # Verify opposite weight changes (reactor up, feed bottle down)
-            if row['reactor_weight_change'] > 0 and row['feed_bottle_weight_change'] < 0:
-                volume = abs(row['feed_bottle_weight_change'])  # Assuming 1g = 1mL
-                
-                event = {
-                    'timestamp': current_time,
-                    'feed_type': 'auto_detected',
-                    'volume': volume / 1000,  # Convert to liters
-                    'reactor_weight_change': row['reactor_weight_change'],
-                    'feed_bottle_weight_change': row['feed_bottle_weight_change']
-                }
-                
-                feed_events.append(event)
-                self.last_detection_time = current_time
-                
-                # Log the detected event if logger provided
-                if feed_logger:
-                    feed_logger.log_event(
-                        feed_type='auto_detected',
-                        volume=event['volume'],
-                        components={},
-                        operator='AUTO_DETECT',
-                        notes=f"Automatically detected feed event. "
-                              f"Reactor weight change: {event['reactor_weight_change']:.2f}g, "
-                              f"Feed bottle change: {event['feed_bottle_weight_change']:.2f}g"
-                    )
+        # Log the detected events if logger provided
+        if feed_logger:
+            for event in feed_events:
+                feed_logger.log_event(
+                    feed_type='auto_detected',
+                    volume=event['volume'],
+                    components={},
+                    operator='AUTO_DETECT',
+                    notes=f"Automatically detected feed event. "
+                          f"Reactor weight change: {event['reactor_weight_change']:.2f}g, "
+                          f"Feed bottle change: {event['feed_bottle_weight_change']:.2f}g"
+                )
                 
         return feed_events
@@ -1,7 +1,6 @@
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 import pandas as pd
-from scipy import stats
 from dataclasses import dataclass
 import logging
 
@@ -9,11 +8,32 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class FeedEvent:
+    __slots__ = ('timestamp', 'feed_type', 'volume', 'composition')
+    
     timestamp: pd.Timestamp
     feed_type: str
     volume: float
     composition: Dict[str, float]
 
+def _slope_r2(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """Least-squares slope of y on x and the coefficient of determination.
+    
+    Equivalent to the slope and rvalue**2 of scipy.stats.linregress, without
+    the standard errors and p-value it computes alongside.
+    """
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = np.dot(dx, dx)
+    sxy = np.dot(dx, dy)
+    syy = np.dot(dy, dy)
+    if sxx == 0.0:
+        return 0.0, 0.0
+    slope = sxy / sxx
+    if syy == 0.0:
+        return slope, 0.0
+    r2 = min(sxy * sxy / (sxx * syy), 1.0)
+    return slope, r2
+
 class BioreactorMetrics:
     def __init__(self, 
                 db: Optional['DatabaseConnection'] = None,
@@ -33,6 +53,27 @@ class BioreactorMetrics:
         """Record a new feed event."""
         self.feed_events.append(event)
         
+    def prepare(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert DO data to time-sorted NumPy arrays for per-event analysis.
+        
+        Event windows are then located by binary search instead of masking
+        the whole DataFrame.
+        
+        Args:
+            data: DataFrame with 'timestamp' and 'do_value' columns
+            
+        Returns:
+            Tuple of (timestamps as int64 ns, DO values as float64)
+        """
+        timestamp_series = pd.to_datetime(data['timestamp'])
+        timestamps = timestamp_series.to_numpy('datetime64[ns]').view('i8')
+        do_values = data['do_value'].to_numpy(dtype=np.float64)
+        # Streamed data is normally already in time order; only sort if not
+        if not timestamp_series.is_monotonic_increasing:
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, do_values = timestamps[order], do_values[order]
+        return timestamps, do_values
+        
     def calculate_do_drop_rate(self, data: pd.DataFrame, 
                              event_time: pd.Timestamp,
                              window_size: Optional[int] = None) -> Tuple[float, float]:
@@ -46,26 +87,29 @@ class BioreactorMetrics:
         Returns:
             Tuple of (drop_rate mg/L/s, r_squared)
         """
-        window_size = window_size or self.analysis_window
+        timestamps, do_values = self.prepare(data)
+        return self._drop_rate_fit(timestamps, do_values, event_time,
+                                   window_size or self.analysis_window)
         
+    @staticmethod
+    def _drop_rate_fit(timestamps: np.ndarray, do_values: np.ndarray,
+                       event_time: pd.Timestamp, window_size: int) -> Tuple[float, float]:
+        """Fit the DO drop after event_time on prepared arrays; see calculate_do_drop_rate."""
         # Get data window after feed event
-        mask = (data['timestamp'] >= event_time) & \
-               (data['timestamp'] <= event_time + pd.Timedelta(seconds=window_size))
-        window_data = data[mask]
+        t0 = pd.Timestamp(event_time).value
+        t1 = t0 + int(window_size * 1_000_000_000)
+        lo = np.searchsorted(timestamps, t0, side='left')
+        hi = np.searchsorted(timestamps, t1, side='right')
         
-        if len(window_data) < 10:  # Minimum points for reliable calculation
+        if hi - lo < 10:  # Minimum points for reliable calculation
             logger.warning(f"Insufficient data points for DO drop rate calculation at {event_time}")
             return 0.0, 0.0
             
         # Calculate time in seconds from event
-        time_delta = (window_data['timestamp'] - event_time).dt.total_seconds()
+        time_delta = (timestamps[lo:hi] - t0) / 1e9
         
         # Linear regression on DO values
-        slope, intercept, r_value, _, _ = stats.linregress(
-            time_delta, window_data['do_value']
-        )
-        
-        return slope, r_value**2
+        return _slope_r2(time_delta, do_values[lo:hi])
         
     def calculate_recovery_time(self, data: pd.DataFrame,
                               event_time: pd.Timestamp,
@@ -80,21 +124,36 @@ class BioreactorMetrics:
         Returns:
             Recovery time in seconds, or None if not recovered
         """
-        initial_do = data[data['timestamp'] <= event_time]['do_value'].iloc[-1]
+        timestamps, do_values = self.prepare(data)
+        return self._recovery_time(timestamps, do_values, event_time, recovery_threshold)
+        
+    @staticmethod
+    def _recovery_time(timestamps: np.ndarray, do_values: np.ndarray,
+                       event_time: pd.Timestamp, recovery_threshold: float) -> Optional[float]:
+        """Find the DO recovery time on prepared arrays; see calculate_recovery_time."""
+        t0 = pd.Timestamp(event_time).value
+        
+        # Last DO value at or before the event
+        before = np.searchsorted(timestamps, t0, side='right')
+        if before == 0:
+            logger.warning(f"No DO data before event at {event_time}")
+            return None
+        initial_do = do_values[before - 1]
         recovery_value = initial_do * recovery_threshold
         
         # Get data after event
-        post_event = data[data['timestamp'] >= event_time]
+        start = np.searchsorted(timestamps, t0, side='left')
         
         # Find first point where DO exceeds recovery threshold
-        recovered = post_event[post_event['do_value'] >= recovery_value]
+        recovered = do_values[start:] >= recovery_value
+        first = recovered.argmax() if len(recovered) else 0
         
-        if len(recovered) == 0:
+        if len(recovered) == 0 or not recovered[first]:
             logger.warning(f"DO recovery not detected for event at {event_time}")
             return None
             
-        recovery_time = (recovered.iloc[0]['timestamp'] - event_time).total_seconds()
-        return recovery_time
+        recovery_time = (timestamps[start + first] - t0) / 1e9
+        return float(recovery_time)
     
     def calculate_our(self, data: pd.DataFrame,
                      event_time: pd.Timestamp,
@@ -111,13 +170,17 @@ class BioreactorMetrics:
         Returns:
             OUR in mg O₂/L/h, or None if calculation not possible
         """
+        # Calculate DO drop rate
+        drop_rate, r_squared = self.calculate_do_drop_rate(data, event_time, window_size)
+        return self._our_from_fit(drop_rate, r_squared, event_time)
+        
+    def _our_from_fit(self, drop_rate: float, r_squared: float,
+                      event_time: pd.Timestamp) -> Optional[float]:
+        """Convert a fitted DO drop rate to OUR, or None if kLa or the fit is unusable."""
         if self.kla is None:
             logger.error("kLa value not provided, cannot calculate OUR")
             return None
             
-        # Calculate DO drop rate
-        drop_rate, r_squared = self.calculate_do_drop_rate(data, event_time, window_size)
-        
         if r_squared < 0.8:  # Minimum R² threshold for reliable calculation
             logger.warning(f"Poor linear fit (R²={r_squared:.2f}) for OUR calculation at {event_time}")
             return None
@@ -125,6 +188,18 @@ class BioreactorMetrics:
         # Convert drop rate from mg/L/s to mg/L/h and calculate OUR
         our = -drop_rate * 3600 * self.kla
         return our
+        
+    @staticmethod
+    def _sour_from_our(our: Optional[float], biomass_concentration: float) -> Optional[float]:
+        """Normalize OUR by biomass concentration, or None if not possible."""
+        if our is None:
+            return None
+            
+        if biomass_concentration <= 0:
+            logger.error(f"Invalid biomass concentration: {biomass_concentration}")
+            return None
+            
+        return our / biomass_concentration
     
     def calculate_sour(self, data: pd.DataFrame,
                       event_time: pd.Timestamp,
@@ -144,15 +219,7 @@ class BioreactorMetrics:
             sOUR in mg O₂/g biomass/h, or None if calculation not possible
         """
         our = self.calculate_our(data, event_time, window_size)
-        
-        if our is None:
-            return None
-            
-        if biomass_concentration <= 0:
-            logger.error(f"Invalid biomass concentration: {biomass_concentration}")
-            return None
-            
-        return our / biomass_concentration
+        return self._sour_from_our(our, biomass_concentration)
     
     def calculate_do_response_metrics(self, data: pd.DataFrame,
                                     event_time: pd.Timestamp,
@@ -167,12 +234,15 @@ class BioreactorMetrics:
         Returns:
             Dictionary containing all calculated metrics
         """
-        drop_rate, r_squared = self.calculate_do_drop_rate(data, event_time)
-        recovery_time = self.calculate_recovery_time(data, event_time)
-        our = self.calculate_our(data, event_time)
+        # The data is converted once; one fit serves the drop rate, OUR and sOUR
+        timestamps, do_values = self.prepare(data)
+        drop_rate, r_squared = self._drop_rate_fit(timestamps, do_values, event_time,
+                                                   self.analysis_window)
+        recovery_time = self._recovery_time(timestamps, do_values, event_time, 0.95)
+        our = self._our_from_fit(drop_rate, r_squared, event_time)
         sour = None
         if biomass_concentration is not None:
-            sour = self.calculate_sour(data, event_time, biomass_concentration)
+            sour = self._sour_from_our(our, biomass_concentration)
             
         return {
             'timestamp': event_time,
@@ -198,25 +268,34 @@ class BioreactorMetrics:
             logger.warning("Insufficient data points for DO saturation calculation")
             return None
             
-        # Ensure data is sorted by timestamp
-        data = data.sort_values('timestamp')
+        timestamps, do_values = self.prepare(data)
         
-        # Calculate time differences and rolling statistics
-        data['time_diff'] = (data['timestamp'] - data['timestamp'].shift()).dt.total_seconds()
-        rolling_std = data['do_value'].rolling(
-            window=self.stability_window // int(data['time_diff'].median()),
-            min_periods=3
-        ).std()
+        # Rolling standard deviation over the stability window (in samples),
+        # from cumulative sums of the mean-centred values; NaNs are skipped
+        sample_interval = int(np.median(np.diff(timestamps)) / 1e9)
+        window = max(self.stability_window // max(sample_interval, 1), 1)
+        valid = ~np.isnan(do_values)
+        centred = np.where(valid, do_values - np.nanmean(do_values), 0.0)
+        csum = np.concatenate(([0.0], np.cumsum(centred)))
+        csq = np.concatenate(([0.0], np.cumsum(centred * centred)))
+        ccount = np.concatenate(([0], np.cumsum(valid)))
+        end = np.arange(1, len(do_values) + 1)
+        start = np.maximum(end - window, 0)
+        n = ccount[end] - ccount[start]
+        total = csum[end] - csum[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (csq[end] - csq[start] - total * total / n) / (n - 1)
+        rolling_std = np.sqrt(np.maximum(variance, 0.0))
         
         # Find stable periods where DO variation is below threshold
-        stable_periods = data[rolling_std <= self.stability_threshold]
+        stable_periods = do_values[(n >= 3) & (rolling_std <= self.stability_threshold)]
         
         if len(stable_periods) < 1:
             logger.warning("No stable periods found for DO saturation calculation")
             return None
             
         # Use median DO value during stable periods as saturation
-        do_saturation = stable_periods['do_value'].median()
+        do_saturation = float(np.nanmedian(stable_periods))
         logger.info(f"Calculated DO saturation: {do_saturation:.2f} mg/L")
         
         return do_saturation
@@ -21,24 +21,65 @@ class ScientificAnnotation:
     operator: str
 
 class ScientificDataExporter:
+    # Standard units for each metric type
+    _UNITS = {
+        'DO Drop Rate': 'mg/L/s',
+        'DO Recovery Time': 's',
+        'OUR': 'mg O₂/L/h',
+        'sOUR': 'mg O₂/g/h',
+        'DO Saturation': 'mg/L',
+        'TSS': 'g/L'
+    }
+
+    _LATEX_SNAPSHOT_TEMPLATE = (
+        "\\begin{table}[h]\n"
+        "\\caption{Oxygen Utilization Metrics at %s}\n"
+        "\\begin{tabular}{lll}\n"
+        "\\hline\n"
+        "Metric & Value & Units \\\\\n"
+        "\\hline\n"
+        "%s"
+        "\\hline\n"
+        "\\end{tabular}\n"
+        "\\label{tab:oxygen_metrics}\n"
+        "\\end{table}\n"
+    )
+
+    _MARKDOWN_SNAPSHOT_TEMPLATE = (
+        "## Oxygen Utilization Metrics (%s)\n\n"
+        "| Metric | Value | Units |\n"
+        "|--------|--------|-------|\n"
+        "%s\n\n"
+        "### Experimental Conditions\n\n"
+        "%s\n"
+    )
+
     def __init__(self, export_dir: str = "scientific_data"):
         self.export_dir = Path(export_dir)
         self.export_dir.mkdir(exist_ok=True)
-        self.annotations_file = self.export_dir / "annotations.json"
+        # One JSON record per line, so adding an annotation is a single append
+        self.annotations_file = self.export_dir / "annotations.jsonl"
+        self.legacy_annotations_file = self.export_dir / "annotations.json"
         self.load_annotations()
 
     def load_annotations(self):
         """Load existing annotations from file."""
         if self.annotations_file.exists():
             with open(self.annotations_file, 'r') as f:
+                self.annotations = [json.loads(line) for line in f if line.strip()]
+        elif self.legacy_annotations_file.exists():
+            # Migrate annotations written by earlier versions as a JSON array
+            with open(self.legacy_annotations_file, 'r') as f:
                 self.annotations = json.load(f)
+            self.save_annotations()
         else:
             self.annotations = []
 
     def save_annotations(self):
-        """Save annotations to file."""
+        """Rewrite the annotations file from the in-memory list."""
         with open(self.annotations_file, 'w') as f:
-            json.dump(self.annotations, f, indent=2, default=str)
+            for annotation_dict in self.annotations:
+                f.write(json.dumps(annotation_dict, separators=(',', ':'), default=str) + '\n')
 
     def add_annotation(self, annotation: ScientificAnnotation):
         """Add a new scientific annotation."""
@@ -54,7 +95,8 @@ class ScientificDataExporter:
             'operator': annotation.operator
         }
         self.annotations.append(annotation_dict)
-        self.save_annotations()
+        with open(self.annotations_file, 'a') as f:
+            f.write(json.dumps(annotation_dict, separators=(',', ':'), default=str) + '\n')
 
     def format_scientific_value(self, value: float, precision: int = 3) -> str:
         """Format a value in scientific notation with proper precision."""
@@ -76,66 +118,36 @@ class ScientificDataExporter:
         Returns:
             Formatted string ready for inclusion in a paper
         """
+        units = self._UNITS
+        # Only float metrics are tabulated; placeholders like 'No data' are skipped
+        values = [(metric, value) for metric, value in metrics_data.items() if isinstance(value, float)]
+        
         if output_format == 'latex':
-            template = (
-                "\\begin{table}[h]\n"
-                "\\caption{Oxygen Utilization Metrics at %s}\n"
-                "\\begin{tabular}{lll}\n"
-                "\\hline\n"
-                "Metric & Value & Units \\\\\n"
-                "\\hline\n"
-                "%s"
-                "\\hline\n"
-                "\\end{tabular}\n"
-                "\\label{tab:oxygen_metrics}\n"
-                "\\end{table}\n"
+            template = self._LATEX_SNAPSHOT_TEMPLATE
+            rows = [
+                f"{metric} & {value:.3e} & {units.get(metric, '-')} \\\\"
+                for metric, value in values
+            ]
+            conditions_text = (
+                "\\begin{itemize}\n"
+                + "".join(f"\\item {cond}: {val}\n" for cond, val in conditions.items())
+                + "\\end{itemize}\n"
             )
             
-            rows = []
-            for metric, value in metrics_data.items():
-                if isinstance(value, float):
-                    formatted_value = self.format_scientific_value(value)
-                    rows.append(f"{metric} & {formatted_value} & {self.get_units(metric)} \\\\")
-            
-            conditions_text = "\\begin{itemize}\n"
-            for cond, val in conditions.items():
-                conditions_text += f"\\item {cond}: {val}\n"
-            conditions_text += "\\end{itemize}\n"
-            
         else:  # markdown
-            template = (
-                "## Oxygen Utilization Metrics (%s)\n\n"
-                "| Metric | Value | Units |\n"
-                "|--------|--------|-------|\n"
-                "%s\n\n"
-                "### Experimental Conditions\n\n"
-                "%s\n"
-            )
-            
-            rows = []
-            for metric, value in metrics_data.items():
-                if isinstance(value, float):
-                    formatted_value = self.format_scientific_value(value)
-                    rows.append(f"| {metric} | {formatted_value} | {self.get_units(metric)} |")
-            
-            conditions_text = ""
-            for cond, val in conditions.items():
-                conditions_text += f"- {cond}: {val}\n"
+            template = self._MARKDOWN_SNAPSHOT_TEMPLATE
+            rows = [
+                f"| {metric} | {value:.3e} | {units.get(metric, '-')} |"
+                for metric, value in values
+            ]
+            conditions_text = "".join(f"- {cond}: {val}\n" for cond, val in conditions.items())
 
         formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
         return template % (formatted_time, "\n".join(rows), conditions_text)
 
     def get_units(self, metric_type: str) -> str:
         """Get standard units for each metric type."""
-        units = {
-            'DO Drop Rate': 'mg/L/s',
-            'DO Recovery Time': 's',
-            'OUR': 'mg O₂/L/h',
-            'sOUR': 'mg O₂/g/h',
-            'DO Saturation': 'mg/L',
-            'TSS': 'g/L'
-        }
-        return units.get(metric_type, '-')
+        return self._UNITS.get(metric_type, '-')
 
     def export_time_series(self,
                           data: pd.DataFrame,
@@ -161,8 +173,9 @@ class ScientificDataExporter:
             )
             
             plots = []
+            timestamps = data['timestamp'].tolist()
             for col in metric_columns:
-                points = [f"({row['timestamp']},{row[col]})" for _, row in data.iterrows()]
+                points = [f"({t},{v})" for t, v in zip(timestamps, data[col].tolist())]
                 plots.append(f"\\addplot coordinates {{{' '.join(points)}}};\n")
                 
         else:  # markdown
@@ -216,12 +229,11 @@ class ScientificDataExporter:
                 "\\end{table}\n"
             )
             
-            rows = []
-            for ann in annotations:
-                rows.append(
-                    f"{ann.metric_type} & {ann.observation} & "
-                    f"{ann.confidence_level*100:.1f}\\% \\\\"
-                )
+            rows = [
+                f"{ann.metric_type} & {ann.observation} & "
+                f"{ann.confidence_level*100:.1f}\\% \\\\"
+                for ann in annotations
+            ]
         else:
             template = (
                 "## Scientific Observations\n\n"
@@ -230,11 +242,10 @@ class ScientificDataExporter:
                 "%s\n"
             )
             
-            rows = []
-            for ann in annotations:
-                rows.append(
-                    f"| {ann.metric_type} | {ann.observation} | "
-                    f"{ann.confidence_level*100:.1f}% |"
-                )
+            rows = [
+                f"| {ann.metric_type} | {ann.observation} | "
+                f"{ann.confidence_level*100:.1f}% |"
+                for ann in annotations
+            ]
 
         return template % "\n".join(rows)
@@ -1,19 +1,334 @@
+"""Database access for the reactor (MS SQL Server) and dashboard (SQLite) stores.
+
+Most reactor queries filter or sort on ReactorData.DateTime. They rely on an
+index on that column, e.g.::
+
+    CREATE INDEX ix_reactordata_datetime ON ReactorData (DateTime DESC)
+"""
 import os
-from typing import Dict, List, Optional
+import time
+import datetime
+import decimal
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 import pandas as pd
-import pyodbc
 from dotenv import load_dotenv
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 import urllib
 from pathlib import Path
+import numpy as np
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Engines are shared by every DatabaseConnection so the connection pool
+# survives across dashboard callbacks instead of being rebuilt per instance.
+_engines: Dict[str, Engine] = {}
+
+def _get_engine(url: str, **kwargs) -> Engine:
+    """Return the shared engine for a URL, creating it on first use.
+    
+    Threads racing on first use may each build an engine, but setdefault is
+    atomic, so all of them get the one that was stored first; the others are
+    discarded before any connection is opened (engines connect lazily).
+    """
+    engine = _engines.get(url)
+    if engine is None:
+        engine = _engines.setdefault(url, create_engine(url, **kwargs))
+    return engine
+
+@lru_cache(maxsize=1)
+def _ensure_data_dir() -> Path:
+    """Create the local data directory once per process and return it."""
+    data_dir = Path('data')
+    data_dir.mkdir(exist_ok=True)
+    return data_dir
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Configure each new dashboard SQLite connection.
+    
+    WAL lets readers proceed during a write and, with synchronous=NORMAL,
+    commits no longer fsync a rollback journal. Reads are memory-mapped and
+    served from a larger page cache, and a writer waits briefly for a lock
+    instead of failing with "database is locked". In-memory databases have
+    no file to journal or map, so they keep SQLite's defaults for those.
+    """
+    cursor = dbapi_conn.cursor()
+    # database_list reports an empty file name for in-memory databases
+    main_file = cursor.execute("PRAGMA database_list").fetchone()[2]
+    if main_file:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.execute("PRAGMA busy_timeout=5000")  # milliseconds
+    cursor.close()
+
+def get_dashboard_engine() -> Engine:
+    """Return the shared engine for the local SQLite dashboard database.
+    
+    Like the reactor engine, it is shared across instances and keeps a
+    pool of open connections, so callbacks do not reopen the file.
+    Connections run in WAL mode (see _set_sqlite_pragmas).
+    """
+    # SQLite database will be stored in data/dashboard.db
+    db_path = _ensure_data_dir() / 'dashboard.db'
+    engine = _get_engine(
+        f'sqlite:///{db_path}',
+        poolclass=QueuePool,
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=10,
+        pool_pre_ping=True
+    )
+    if not event.contains(engine, 'connect', _set_sqlite_pragmas):
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+    return engine
+
+# SQLite allows one writer at a time. Serializing writes in-process means
+# concurrent callbacks queue here instead of contending for the database
+# lock, while WAL lets reads proceed alongside the single writer.
+_dashboard_write_lock = threading.Lock()
+
+@contextmanager
+def dashboard_transaction():
+    """Open a write transaction on the dashboard database, one writer at a time.
+    
+    Commits when the block exits normally and rolls back on an exception.
+    Reads do not need this; use get_dashboard_engine().connect().
+    """
+    with _dashboard_write_lock, get_dashboard_engine().begin() as conn:
+        yield conn
+
+# Shared dashboard engines whose tables have already been created, so the
+# DDL runs once per process rather than once per DatabaseConnection
+_initialized_engines = set()
+
+# Shared reactor engines that have answered a test query. A failed check is
+# not recorded, so the next DatabaseConnection tries again.
+_verified_engines = set()
+
+# Worker threads for issuing independent queries concurrently. pyodbc and
+# sqlite3 release the GIL while waiting on the database, so the round-trips
+# overlap instead of adding up.
+_query_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('DB_POOL_SIZE', 5)),
+    thread_name_prefix='db-query'
+)
+
+_LATEST_DATA_SELECT = """
+    SELECT 
+        DateTime as timestamp,  -- Explicitly name as timestamp
+        -- Rest of columns
+        LB_MFC_1_SP,
+        LB_MFC_1_PV,
+        Reactor_1_DO_Value_PPM,
+        Reactor_1_DO_T_Value,
+        Reactor_1_PH_Value,
+        Reactor_1_PH_T_Value,
+        R1_Weight_Bal,
+        R2_Weight_Bal,
+        LB_Perastaltic_P_1,
+        R1_Perastaltic_1_Time,
+        R1_Perastaltic_1_Time_off,
+        Reactor_1_Speed_RPM,
+        Reactor_1_Torque_Real
+    FROM ReactorData
+"""
+
+# Aggregate used for each reactor column when samples are bucketed. The
+# pump status is a state, so its MAX is kept; everything else is averaged.
+_BUCKET_AGGREGATES = {
+    'LB_MFC_1_SP': 'AVG(CAST(LB_MFC_1_SP AS FLOAT))',
+    'LB_MFC_1_PV': 'AVG(CAST(LB_MFC_1_PV AS FLOAT))',
+    'Reactor_1_DO_Value_PPM': 'AVG(CAST(Reactor_1_DO_Value_PPM AS FLOAT))',
+    'Reactor_1_DO_T_Value': 'AVG(CAST(Reactor_1_DO_T_Value AS FLOAT))',
+    'Reactor_1_PH_Value': 'AVG(CAST(Reactor_1_PH_Value AS FLOAT))',
+    'Reactor_1_PH_T_Value': 'AVG(CAST(Reactor_1_PH_T_Value AS FLOAT))',
+    'R1_Weight_Bal': 'AVG(CAST(R1_Weight_Bal AS FLOAT))',
+    'R2_Weight_Bal': 'AVG(CAST(R2_Weight_Bal AS FLOAT))',
+    'LB_Perastaltic_P_1': 'MAX(LB_Perastaltic_P_1)',
+    'R1_Perastaltic_1_Time': 'AVG(CAST(R1_Perastaltic_1_Time AS FLOAT))',
+    'R1_Perastaltic_1_Time_off': 'AVG(CAST(R1_Perastaltic_1_Time_off AS FLOAT))',
+    'Reactor_1_Speed_RPM': 'AVG(CAST(Reactor_1_Speed_RPM AS FLOAT))',
+    'Reactor_1_Torque_Real': 'AVG(CAST(Reactor_1_Torque_Real AS FLOAT))'
+}
+
+@lru_cache(maxsize=16)
+def _latest_data_bucketed_sql(columns: tuple) -> str:
+    """Per-bucket aggregates of the given columns over the last N minutes.
+    
+    Parameters: bucket seconds (twice) and minutes. Only the named columns
+    are read and aggregated, so narrow requests scan and send less.
+    """
+    aggregates = ',\n        '.join(
+        f'{_BUCKET_AGGREGATES[column]} AS {column}' for column in columns
+    )
+    return f"""
+    SELECT
+        DATEADD(second, bucket * ?, '2020-01-01') AS timestamp,
+        {aggregates}
+    FROM (
+        SELECT DATEDIFF(second, '2020-01-01', DateTime) / ? AS bucket,
+            {', '.join(columns)}
+        FROM ReactorData
+        WHERE DateTime >= DATEADD(minute, -?, GETDATE())
+    ) AS samples
+    GROUP BY bucket
+    ORDER BY bucket ASC
+"""
+
+# Newest row only; MAX(DateTime) is answered by a single seek on the
+# DateTime index, with no sort over the table
+_CURRENT_VALUES_SQL = """
+    SELECT TOP 1
+        -- MFC1 values
+        LB_MFC_1_SP,
+        LB_MFC_1_PV,
+        -- Reactor 1 DO
+        Reactor_1_DO_Value_PPM,
+        Reactor_1_DO_T_Value,
+        -- Reactor 1 pH
+        Reactor_1_PH_Value,
+        Reactor_1_PH_T_Value,
+        -- Weights
+        R1_Weight_Bal,
+        R2_Weight_Bal,
+        -- Pump 1 settings
+        LB_Perastaltic_P_1,
+        R1_Perastaltic_1_Time,
+        R1_Perastaltic_1_Time_off,
+        -- Speed and torque
+        Reactor_1_Speed_RPM,
+        Reactor_1_Torque_Real
+    FROM ReactorData
+    WHERE DateTime = (SELECT MAX(DateTime) FROM ReactorData)
+"""
+
+class ReactorSnapshot(NamedTuple):
+    """Most recent reactor readings, in _CURRENT_VALUES_SQL column order."""
+    mfc1_sp: float
+    mfc1_pv: float
+    do_value: float
+    do_temp: float
+    ph_value: float
+    ph_temp: float
+    weight_r1: float
+    weight_r2: float
+    pump_status: float
+    pump_time_on: float
+    pump_time_off: float
+    speed: float
+    torque: float
+
+    def to_dict(self) -> Dict:
+        """Return the readings grouped by instrument as nested dictionaries."""
+        return {
+            'mfc1': {
+                'sp': self.mfc1_sp,
+                'pv': self.mfc1_pv
+            },
+            'do': {
+                'value': self.do_value,
+                'temp': self.do_temp
+            },
+            'ph': {
+                'value': self.ph_value,
+                'temp': self.ph_temp
+            },
+            'weights': {
+                'r1': self.weight_r1,
+                'r2': self.weight_r2
+            },
+            'pump': {
+                'status': self.pump_status,
+                'time_on': self.pump_time_on,
+                'time_off': self.pump_time_off
+            },
+            'operation': {
+                'speed': self.speed,
+                'torque': self.torque
+            }
+        }
+
+# Dashboard (SQLite) statements
+_FEED_PARAMETERS_DDL = text("""
+    CREATE TABLE IF NOT EXISTS feed_parameters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feed_type VARCHAR(50) NOT NULL,
+        toc_value FLOAT,
+        glucose_concentration FLOAT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+
+_PROCESS_PARAMETERS_DDL = text("""
+    CREATE TABLE IF NOT EXISTS process_parameters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tss_value FLOAT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+
+_SAVE_FEED_PARAMETERS_SQL = text("""
+    INSERT INTO feed_parameters (feed_type, toc_value, glucose_concentration)
+    VALUES (:feed_type, :toc, :glucose_conc)
+""")
+
+_FEED_PARAMETERS_SQL = text("""
+    SELECT feed_type, toc_value, glucose_concentration, timestamp
+    FROM feed_parameters
+    ORDER BY timestamp DESC, id DESC
+    LIMIT 1
+""")
+
+_HISTORICAL_COLUMNS = [
+    'timestamp', 'do_value', 'ph_value', 'temperature',
+    'agitation', 'reactor_weight', 'feed_bottle_weight'
+]
+
+_HISTORICAL_DATA_SQL = f"""
+    SELECT {', '.join(_HISTORICAL_COLUMNS)}
+    FROM sensor_data
+    WHERE timestamp BETWEEN ? AND ?
+    ORDER BY timestamp ASC
+"""
+
+# Rows per fetchmany() round-trip when streaming historical data
+_HISTORICAL_FETCH_SIZE = 5000
+
+# Column dtypes for empty query results, by the Python type pyodbc reports
+# in cursor.description, so empty frames concatenate without object upcasts
+_EMPTY_RESULT_DTYPES = {
+    float: 'float64',
+    decimal.Decimal: 'float64',
+    int: 'int64',
+    bool: 'bool',
+    datetime.datetime: 'datetime64[ns]'
+}
+
 class DatabaseConnection:
+    # Lifetime (seconds) of cached reactor reads. Dashboard callbacks and the
+    # AI analyzer poll with identical arguments every few seconds.
+    CURRENT_VALUES_TTL = 1.0
+    LATEST_DATA_TTL = 10.0
+    # Feed parameters only change through save_feed_parameters, which
+    # invalidates the cache, so they can be kept much longer
+    FEED_PARAMETERS_TTL = 300.0
+    # Delay (seconds) before queued feed parameter writes are committed
+    FEED_FLUSH_INTERVAL = 0.5
+    # Rows passed to each executemany call by save_feed_parameters_bulk
+    FEED_BULK_CHUNK_SIZE = 500
+
     def __init__(self, required: bool = False):
         """Initialize database connections using environment variables.
         
@@ -23,6 +338,21 @@ class DatabaseConnection:
         """
         self.is_connected = False
         self.required = required
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._current_values_lock = threading.Lock()
+        # Trailing window of reactor rows kept between get_latest_data calls,
+        # so each poll only fetches rows newer than the watermark
+        self._history = pd.DataFrame()
+        self._history_minutes = 0
+        self._last_seen: Optional[pd.Timestamp] = None
+        self._history_lock = threading.Lock()
+        # Feed parameter rows waiting to be written in one batch
+        self._pending_feeds = deque()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
         
         # MS SQL Server connection string components
         self.server = os.getenv('MSSQL_SERVER', 'localhost')
@@ -35,10 +365,13 @@ class DatabaseConnection:
         
         try:
             self.conn_str = self._build_connection_string()
+            self._quoted_conn_str = urllib.parse.quote_plus(self.conn_str)
             self.reactor_engine = self._create_reactor_engine()
             self.dashboard_engine = self._create_dashboard_engine()
-            self.initialize_dashboard_database()
-            self._test_connection()
+            if self.dashboard_engine not in _initialized_engines:
+                self.initialize_dashboard_database()
+            if self.reactor_engine not in _verified_engines:
+                self._test_connection()
             self.is_connected = True
             logger.info("Database connection established successfully")
         except Exception as e:
@@ -63,228 +396,421 @@ class DatabaseConnection:
         
         return conn_str
         
-    def _test_connection(self):
-        """Test the database connection and log the result."""
-        try:
-            with pyodbc.connect(self.conn_str) as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT @@version")
-                    version = cursor.fetchone()[0]
-                    logger.info(f"Successfully connected to MS SQL Server: {version}")
-        except Exception as e:
-            logger.error(f"Failed to connect to database: {e}")
-            raise
-
     def _create_reactor_engine(self):
-        """Create SQLAlchemy engine for read-only Reactor database connection."""
-        params = urllib.parse.quote_plus(self.conn_str)
+        """Create SQLAlchemy engine for read-only Reactor database connection.
         
-        return create_engine(f'mssql+pyodbc:///?odbc_connect={params}')
+        Connections are pooled and validated with a lightweight ping on
+        checkout, so the ODBC handshake is only paid when a pooled
+        connection is first opened or has gone stale. The pool size can be
+        tuned with the DB_POOL_SIZE environment variable.
+        """
+        return _get_engine(
+            f'mssql+pyodbc:///?odbc_connect={self._quoted_conn_str}',
+            poolclass=QueuePool,
+            pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+            max_overflow=10,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            fast_executemany=True
+        )
+
+    def _test_connection(self):
+        """Check that SQL Server answers a trivial query on the shared engine.
+        
+        Runs once per engine, so only the first DatabaseConnection pays the
+        round-trip. Raises if the server cannot be reached.
+        """
+        with self.reactor_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        _verified_engines.add(self.reactor_engine)
+        logger.info(f"Successfully connected to MS SQL Server at {self.server}")
 
     def _create_dashboard_engine(self):
         """Create SQLAlchemy engine for local SQLite dashboard database."""
-        # Create data directory if it doesn't exist
-        data_dir = Path('data')
-        data_dir.mkdir(exist_ok=True)
-        
-        # SQLite database will be stored in data/dashboard.db
-        db_path = data_dir / 'dashboard.db'
-        return create_engine(f'sqlite:///{db_path}')
+        return get_dashboard_engine()
+
+    def _cache_get(self, key: tuple):
+        """Return a cached value if it has not expired, otherwise None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache_hits += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Cache hit for {key[0]} ({self._cache_hits} hits, {self._cache_misses} misses)")
+                return entry[1]
+            self._cache_misses += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache miss for {key[0]} ({self._cache_hits} hits, {self._cache_misses} misses)")
+            return None
+
+    def _cache_put(self, key: tuple, value, ttl: float):
+        """Store a value in the read cache for ttl seconds."""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+
+    def _invalidate_cache(self):
+        """Drop all cached reads, e.g. after a write."""
+        with self._cache_lock:
+            self._cache.clear()
 
     def initialize_dashboard_database(self):
         """Initialize dashboard database tables if they don't exist."""
-        feed_params_table = text("""
-            CREATE TABLE IF NOT EXISTS feed_parameters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feed_type VARCHAR(50) NOT NULL,
-                toc_value FLOAT,
-                glucose_concentration FLOAT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        process_params_table = text("""
-            CREATE TABLE IF NOT EXISTS process_parameters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                tss_value FLOAT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
         try:
-            with self.dashboard_engine.connect() as conn:
-                conn.execute(feed_params_table)
-                conn.execute(process_params_table)
-                conn.commit()
-                print("Dashboard database initialized successfully")
+            with dashboard_transaction() as conn:
+                conn.execute(_FEED_PARAMETERS_DDL)
+                conn.execute(_PROCESS_PARAMETERS_DDL)
+                _initialized_engines.add(self.dashboard_engine)
+                logger.info("Dashboard database initialized successfully")
         except Exception as e:
-            print(f"Error initializing dashboard database: {e}")
-
-    def get_latest_data(self, minutes: int = 5) -> pd.DataFrame:
-        """Fetch the latest data from the reactor database."""
-        query = text("""
-            SELECT 
-                DateTime as timestamp,  -- Explicitly name as timestamp
-                -- Rest of columns
-                LB_MFC_1_SP,
-                LB_MFC_1_PV,
-                Reactor_1_DO_Value_PPM,
-                Reactor_1_DO_T_Value,
-                Reactor_1_PH_Value,
-                Reactor_1_PH_T_Value,
-                R1_Weight_Bal,
-                R2_Weight_Bal,
-                LB_Perastaltic_P_1,
-                R1_Perastaltic_1_Time,
-                R1_Perastaltic_1_Time_off,
-                Reactor_1_Speed_RPM,
-                Reactor_1_Torque_Real
-            FROM ReactorData
-            WHERE DateTime >= DATEADD(minute, -:minutes, GETDATE())
-            ORDER BY DateTime ASC
-        """)
+            logger.error(f"Error initializing dashboard database: {e}")
+
+    def _read_frame(self, sql: str, params: tuple = (),
+                    parse_dates: Sequence[str] = ('timestamp',)) -> pd.DataFrame:
+        """Run a query on the reactor database and build a DataFrame from it.
         
-        try:
-            with self.reactor_engine.connect() as conn:
-                df = pd.read_sql_query(query, conn, params={'minutes': minutes})
-                # Ensure timestamp is datetime type
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+        Rows are fetched straight from the pyodbc cursor, skipping the
+        SQLAlchemy result and Row layer that pd.read_sql_query goes through.
+        
+        Args:
+            sql: Query using qmark (?) placeholders
+            params: Positional query parameters
+            parse_dates: Columns to return as datetime64. Columns built from
+                        datetime values are already typed and left as is;
+                        only others are converted.
+            
+        Returns:
+            DataFrame with one column per selected field. An empty result
+            still has each column typed after the SQL column type.
+        """
+        return self._execute_frame(sql, params, parse_dates, server_time=False)[1]
+
+    def _read_frame_with_server_time(self, sql: str, params: tuple = (),
+                                     parse_dates: Sequence[str] = ('timestamp',)
+                                     ) -> Tuple[pd.Timestamp, pd.DataFrame]:
+        """Like _read_frame, but also return SQL Server's current time.
+        
+        GETDATE() is read in the same batch as the query, so windows can be
+        measured against the server's clock, which the stored DateTime
+        values follow, at no extra round-trip.
+        """
+        return self._execute_frame(sql, params, parse_dates, server_time=True)
+
+    def _execute_frame(self, sql: str, params: tuple, parse_dates: Sequence[str],
+                       server_time: bool) -> Tuple[Optional[pd.Timestamp], pd.DataFrame]:
+        """Shared implementation of _read_frame and _read_frame_with_server_time."""
+        now = None
+        with self.reactor_engine.connect() as conn:
+            cursor = conn.connection.cursor()
+            cursor.arraysize = 10_000
+            try:
+                if server_time:
+                    cursor.execute("SELECT GETDATE();\n" + sql, params)
+                    now = pd.Timestamp(cursor.fetchone()[0])
+                    cursor.nextset()
+                else:
+                    cursor.execute(sql, params)
+                description = cursor.description
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        if not rows:
+            return now, pd.DataFrame({
+                column[0]: pd.Series(dtype=_EMPTY_RESULT_DTYPES.get(column[1], object))
+                for column in description
+            })
+        df = pd.DataFrame.from_records(rows, columns=[column[0] for column in description],
+                                       coerce_float=True)
+        for column in parse_dates:
+            if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = pd.to_datetime(df[column])
+        return now, df
+
+    def get_latest_data(self, minutes: int = 5, bucket_seconds: int = 0,
+                        columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Fetch the latest data from the reactor database.
+        
+        The first call (or a call for a longer window than seen so far) reads
+        the whole window. Later calls only fetch rows newer than the last one
+        received and append them to a locally kept trailing window. The
+        window is trimmed against SQL Server's clock (GETDATE(), read with
+        each fetch), not the local clock, so a skewed or differently zoned
+        dashboard host does not drop rows, and data stops being returned
+        once it is older than the window, as when filtering on the server.
+        
+        Args:
+            minutes: Length of the window ending now on the server's clock
+            bucket_seconds: If positive, average the samples into buckets of
+                           this many seconds on the server (timestamp is the
+                           bucket start), so only one row per bucket is sent
+            columns: Reactor columns to return besides timestamp (default
+                    all). With bucket_seconds, only these are read and
+                    aggregated on the server.
+        """
+        columns = tuple(columns) if columns else tuple(_BUCKET_AGGREGATES)
+        cache_key = ('latest_data', minutes, bucket_seconds, columns)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            # Deep copy: callers may modify the frame in place
+            return cached.copy()
+
+        if bucket_seconds > 0:
+            try:
+                df = self._read_frame(
+                    _latest_data_bucketed_sql(columns),
+                    (bucket_seconds, bucket_seconds, minutes)
+                )
+                self._cache_put(cache_key, df.copy(), self.LATEST_DATA_TTL)
                 return df
+            except Exception as e:
+                logger.error(f"Error fetching data: {e}")
+                return pd.DataFrame()
+
+        try:
+            with self._history_lock:
+                if self._last_seen is None or minutes > self._history_minutes:
+                    now, history = self._read_frame_with_server_time(
+                        _LATEST_DATA_SELECT + """
+                            WHERE DateTime >= DATEADD(minute, -?, GETDATE())
+                            ORDER BY DateTime ASC
+                        """,
+                        (minutes,)
+                    )
+                    self._history_minutes = minutes
+                else:
+                    now, delta = self._read_frame_with_server_time(
+                        _LATEST_DATA_SELECT + """
+                            WHERE DateTime > ?
+                            ORDER BY DateTime ASC
+                        """,
+                        (self._last_seen.to_pydatetime(),)
+                    )
+                    delta = delta[delta['timestamp'] > self._last_seen]
+                    history = self._history
+                    if not delta.empty:
+                        history = pd.concat([history, delta], ignore_index=True)
+                    
+                if not history.empty:
+                    # Rows arrive in DateTime order, so the newest is last
+                    self._last_seen = history['timestamp'].iat[-1]
+                    cutoff = now - pd.Timedelta(minutes=self._history_minutes)
+                    history = history[history['timestamp'] >= cutoff].reset_index(drop=True)
+                self._history = history
+                
+            df = history[history['timestamp'] >= now - pd.Timedelta(minutes=minutes)]
+            if len(columns) < len(_BUCKET_AGGREGATES):
+                df = df[['timestamp', *columns]]
+            df = df.reset_index(drop=True)
+            self._cache_put(cache_key, df.copy(), self.LATEST_DATA_TTL)
+            return df
         except Exception as e:
             logger.error(f"Error fetching data: {e}")
             return pd.DataFrame()
 
-    def get_current_values(self) -> Dict:
-        """Get the most recent values for all monitored parameters."""
-        query = text("""
-            SELECT TOP 1
-                -- MFC1 values
-                LB_MFC_1_SP,
-                LB_MFC_1_PV,
-                -- Reactor 1 DO
-                Reactor_1_DO_Value_PPM,
-                Reactor_1_DO_T_Value,
-                -- Reactor 1 pH
-                Reactor_1_PH_Value,
-                Reactor_1_PH_T_Value,
-                -- Weights
-                R1_Weight_Bal,
-                R2_Weight_Bal,
-                -- Pump 1 settings
-                LB_Perastaltic_P_1,
-                R1_Perastaltic_1_Time,
-                R1_Perastaltic_1_Time_off,
-                -- Speed and torque
-                Reactor_1_Speed_RPM,
-                Reactor_1_Torque_Real
-            FROM ReactorData
-            ORDER BY DateTime DESC
-        """)
+    def get_current_values(self) -> Optional[ReactorSnapshot]:
+        """Get the most recent values for all monitored parameters.
         
-        try:
-            with self.reactor_engine.connect() as conn:
-                result = conn.execute(query).fetchone()
-                if result:
-                    return {
-                        'mfc1': {
-                            'sp': result.LB_MFC_1_SP,
-                            'pv': result.LB_MFC_1_PV
-                        },
-                        'do': {
-                            'value': result.Reactor_1_DO_Value_PPM,
-                            'temp': result.Reactor_1_DO_T_Value
-                        },
-                        'ph': {
-                            'value': result.Reactor_1_PH_Value,
-                            'temp': result.Reactor_1_PH_T_Value
-                        },
-                        'weights': {
-                            'r1': result.R1_Weight_Bal,
-                            'r2': result.R2_Weight_Bal
-                        },
-                        'pump': {
-                            'status': result.LB_Perastaltic_P_1,
-                            'time_on': result.R1_Perastaltic_1_Time,
-                            'time_off': result.R1_Perastaltic_1_Time_off
-                        },
-                        'operation': {
-                            'speed': result.Reactor_1_Speed_RPM,
-                            'torque': result.Reactor_1_Torque_Real
-                        }
-                    }
-                return {}
-        except Exception as e:
-            print(f"Error fetching current values: {e}")
-            return {}
+        Returns:
+            ReactorSnapshot of the newest row (use to_dict() for the nested
+            dictionary form), or None if no data is available
+        """
+        cached = self._cache_get(('current_values',))
+        if cached is not None:
+            return cached
+
+        # Single flight: callers that miss together wait for one query and
+        # then share its cached result
+        with self._current_values_lock:
+            cached = self._cache_get(('current_values',))
+            if cached is not None:
+                return cached
+            try:
+                # Single-row hot path: raw cursor and positional access, no
+                # SQLAlchemy statement compilation or Row attribute lookups
+                with self.reactor_engine.connect() as conn:
+                    cursor = conn.connection.cursor()
+                    try:
+                        row = cursor.execute(_CURRENT_VALUES_SQL).fetchone()
+                    finally:
+                        cursor.close()
+                if row:
+                    values = ReactorSnapshot._make(row)
+                    self._cache_put(('current_values',), values, self.CURRENT_VALUES_TTL)
+                    return values
+                return None
+            except Exception as e:
+                logger.error(f"Error fetching current values: {e}")
+                return None
 
     def save_feed_parameters(self, feed_type: str, toc: float = None, glucose_conc: float = None) -> bool:
-        """Save feed parameters to the dashboard database."""
-        query = text("""
-            INSERT INTO feed_parameters (feed_type, toc_value, glucose_concentration)
-            VALUES (:feed_type, :toc, :glucose_conc)
-        """)
+        """Save feed parameters to the dashboard database.
         
+        The row is queued and written, together with any others saved in the
+        meantime, by a single executemany and commit FEED_FLUSH_INTERVAL
+        seconds later. Call flush() to write pending rows immediately and
+        learn whether the write succeeded.
+        
+        Returns:
+            True once the row is queued
+        """
+        self._pending_feeds.append({
+            "feed_type": feed_type,
+            "toc": toc,
+            "glucose_conc": glucose_conc
+        })
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FEED_FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return True
+
+    def flush(self) -> bool:
+        """Write all queued feed parameters in one transaction.
+        
+        If the write fails, the rows are put back at the front of the queue
+        and written by the next flush.
+        
+        Returns:
+            True if nothing is left queued
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            rows = []
+            while self._pending_feeds:
+                rows.append(self._pending_feeds.popleft())
+            if not rows or self.save_feed_parameters_bulk(rows):
+                return True
+            self._pending_feeds.extendleft(reversed(rows))
+            logger.error(f"{len(rows)} feed parameter rows kept queued for the next flush")
+            return False
+
+    def save_feed_parameters_bulk(self, rows: List[Dict]) -> bool:
+        """Write many feed parameter rows in a single transaction.
+        
+        Rows are sent with executemany in chunks of FEED_BULK_CHUNK_SIZE,
+        all between one BEGIN and COMMIT, so the batch costs one commit
+        however many rows it holds and large imports are not converted to
+        parameter dictionaries all at once.
+        
+        Args:
+            rows: Dictionaries with a 'feed_type' key and optional 'toc' and
+                  'glucose_conc' keys, as accepted by save_feed_parameters
+                  
+        Returns:
+            True if the rows were written
+        """
+        if not rows:
+            return True
         try:
-            with self.dashboard_engine.connect() as conn:
-                conn.execute(query, 
-                           {"feed_type": feed_type, 
-                            "toc": toc, 
-                            "glucose_conc": glucose_conc})
-                conn.commit()
-                print("Feed parameters saved successfully")
+            with dashboard_transaction() as conn:
+                for start in range(0, len(rows), self.FEED_BULK_CHUNK_SIZE):
+                    conn.execute(_SAVE_FEED_PARAMETERS_SQL, [
+                        {
+                            'feed_type': row['feed_type'],
+                            'toc': row.get('toc'),
+                            'glucose_conc': row.get('glucose_conc')
+                        }
+                        for row in rows[start:start + self.FEED_BULK_CHUNK_SIZE]
+                    ])
+            self._invalidate_cache()
+            logger.debug(f"Feed parameters saved ({len(rows)} rows)")
+            return True
         except Exception as e:
-            print(f"Error saving feed parameters: {e}")
+            logger.error(f"Error saving feed parameters: {e}")
+            return False
 
     def get_feed_parameters(self) -> Dict:
         """Get the current feed parameters."""
-        query = text("""
-            SELECT feed_type, toc_value, glucose_concentration, timestamp
-            FROM feed_parameters
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        
+        if self._pending_feeds:
+            self.flush()  # Read our own queued writes
+        cached = self._cache_get(('feed_parameters',))
+        if cached is not None:
+            return cached
+
         try:
             with self.dashboard_engine.connect() as conn:
-                result = conn.execute(query).fetchone()
+                result = conn.execute(_FEED_PARAMETERS_SQL).fetchone()
                 if result:
-                    return {
+                    params = {
                         'feed_type': result[0],
                         'toc_value': result[1],
                         'glucose_concentration': result[2],
                         'timestamp': result[3]
                     }
+                    self._cache_put(('feed_parameters',), params, self.FEED_PARAMETERS_TTL)
+                    return params
         except Exception as e:
-            print(f"Error fetching feed parameters: {e}")
+            logger.error(f"Error fetching feed parameters: {e}")
         
         return {}
 
-    def get_historical_data(self, start_time: str, end_time: str) -> pd.DataFrame:
+    def get_historical_data(self, start_time: str, end_time: str, raw: bool = False,
+                            dtype=np.float64) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
         """Fetch historical data between specified timestamps.
         
+        Rows are streamed in fetchmany() chunks straight into preallocated
+        NumPy buffers, which grow geometrically, so a long range never
+        builds a full list of row tuples in memory.
+        
         Args:
             start_time: Start timestamp in ISO format
             end_time: End timestamp in ISO format
+            raw: Return a dict of column arrays (timestamps as datetime64[ns],
+                 values as dtype) instead of building a DataFrame
+            dtype: Float type of the sensor value columns. Pass np.float32
+                   to halve the memory of long ranges for plotting; it keeps
+                   only about 7 significant digits.
             
         Returns:
             DataFrame containing the historical sensor data
         """
-        query = text("""
-            SELECT timestamp, do_value, ph_value, temperature, 
-                   agitation, reactor_weight, feed_bottle_weight
-            FROM sensor_data
-            WHERE timestamp BETWEEN :start_time AND :end_time
-            ORDER BY timestamp ASC
-        """)
+        capacity = 4096
+        timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        values = np.empty((capacity, len(_HISTORICAL_COLUMNS) - 1), dtype=dtype)
+        count = 0
         
         with self.reactor_engine.connect() as conn:
-            df = pd.read_sql_query(
-                query, 
-                conn, 
-                params={'start_time': start_time, 'end_time': end_time}
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            return df
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(_HISTORICAL_DATA_SQL, (start_time, end_time))
+                while True:
+                    rows = cursor.fetchmany(_HISTORICAL_FETCH_SIZE)
+                    if not rows:
+                        break
+                    end = count + len(rows)
+                    if end > capacity:
+                        capacity = max(capacity * 2, end)
+                        timestamps = np.resize(timestamps, capacity)
+                        values = np.resize(values, (capacity, values.shape[1]))
+                    timestamps[count:end] = [row[0] for row in rows]
+                    values[count:end] = [tuple(row[1:]) for row in rows]
+                    count = end
+            finally:
+                cursor.close()
+        
+        if raw:
+            columns = {'timestamp': timestamps[:count]}
+            for j, name in enumerate(_HISTORICAL_COLUMNS[1:]):
+                columns[name] = values[:count, j]
+            return columns
+        
+        df = pd.DataFrame(values[:count], columns=_HISTORICAL_COLUMNS[1:])
+        df.insert(0, 'timestamp', timestamps[:count])
+        return df
+
+    def run_concurrently(self, *calls: Callable[[], Any]) -> List[Any]:
+        """Run independent queries concurrently and return their results in order.
+        
+        Args:
+            calls: Zero-argument callables, each issuing one query
+            
+        Returns:
+            List with the result of each call, in the order given
+        """
+        futures = [_query_executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
 
     def __enter__(self):
         """Enter the runtime context related to this object."""
@@ -293,6 +819,7 @@ class DatabaseConnection:
     def __exit__(self, exc_type, exc_value, traceback):
         """Exit the runtime context related to this object."""
         if self.is_connected:
+            self.flush()
             self.reactor_engine.dispose()
             self.dashboard_engine.dispose()
             self.is_connected = False
@@ -1,29 +1,179 @@
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 import json
 from pathlib import Path
 import logging
+import threading
+import time
+from collections import deque
+from sqlalchemy import text
+from data.database import dashboard_transaction, get_dashboard_engine
 
 logger = logging.getLogger(__name__)
 
+# Events are appended to a table in the dashboard database. Timestamps are
+# ISO 8601 strings, which sort and compare chronologically as text.
+_FEED_EVENTS_DDL = text("""
+    CREATE TABLE IF NOT EXISTS feed_events (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        feed_type TEXT NOT NULL,
+        volume REAL,
+        components TEXT,
+        operator TEXT,
+        notes TEXT
+    )
+""")
+
+_FEED_EVENTS_INDEXES = (
+    text("CREATE INDEX IF NOT EXISTS ix_feed_events_timestamp ON feed_events (timestamp)"),
+    text("CREATE INDEX IF NOT EXISTS ix_feed_events_feed_type ON feed_events (feed_type, timestamp)")
+)
+
+_INSERT_FEED_EVENT_SQL = text("""
+    INSERT INTO feed_events (timestamp, feed_type, volume, components, operator, notes)
+    VALUES (:timestamp, :feed_type, :volume, :components, :operator, :notes)
+""")
+
+# Legacy JSON logs already imported, by file name, so the file itself can
+# stay where it is
+_MIGRATED_LOGS_DDL = text("""
+    CREATE TABLE IF NOT EXISTS feed_event_migrations (
+        log_file TEXT PRIMARY KEY,
+        migrated_at TEXT NOT NULL
+    )
+""")
+
+_LOG_MIGRATED_SQL = text("SELECT 1 FROM feed_event_migrations WHERE log_file = :log_file")
+
+_RECORD_MIGRATION_SQL = text("""
+    INSERT INTO feed_event_migrations (log_file, migrated_at)
+    VALUES (:log_file, :migrated_at)
+""")
+
+_FEED_EVENT_COLUMNS = ('timestamp', 'feed_type', 'volume', 'components', 'operator', 'notes')
+
+_ALL_FEED_EVENTS_SQL = text(f"""
+    SELECT {', '.join(_FEED_EVENT_COLUMNS)}
+    FROM feed_events
+    ORDER BY timestamp ASC, id ASC
+""")
+
 class FeedEventLogger:
+    # Delay (seconds) before queued events are written to the database
+    FLUSH_INTERVAL = 0.1
+
     def __init__(self, log_file: str = "feed_events.json"):
+        """Initialize the feed event log.
+
+        Args:
+            log_file: Name of the legacy JSON log under data/. If it exists, its
+                     events are imported into the database once; the import
+                     is recorded in the database and the file is left as is.
+        """
         self.log_file = Path("data") / log_file
-        self.log_file.parent.mkdir(exist_ok=True)
-        if not self.log_file.exists():
-            self._initialize_log_file()
-        self.events = []
+        self.engine = get_dashboard_engine()
+        self._initialize_table()
+        # Every logged event, oldest first. The table is only read here; later
+        # events are appended both to it and to this list, so queries are
+        # answered from memory. Queries return copies, so callers cannot
+        # reorder it.
+        loaded = self._load_events()
+        loaded.sort(key=lambda pair: pair[0])
+        self.events = [event for _, event in loaded]
+        # Parallel sorted list of event times as epoch seconds, for bisecting
+        # time ranges with float comparisons
+        self._epochs = [epoch for epoch, _ in loaded]
+        # Guards events and _epochs together; callbacks log and read
+        # concurrently, and the two lists must stay aligned for bisecting
+        self._events_lock = threading.Lock()
+        # Event rows waiting to be written in one batch
+        self._pending = deque()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+
+    def _initialize_table(self):
+        """Create the feed_events table and its indexes if they don't exist.
+        
+        Errors are logged rather than raised, so the dashboard still starts
+        if the database is locked or read-only; events are then kept in
+        memory and their writes stay queued.
+        """
+        try:
+            with dashboard_transaction() as conn:
+                conn.execute(_FEED_EVENTS_DDL)
+                conn.execute(_MIGRATED_LOGS_DDL)
+                for index in _FEED_EVENTS_INDEXES:
+                    conn.execute(index)
+        except Exception as e:
+            logger.error(f"Error initializing feed events table: {e}")
+            return
+        if self.log_file.exists():
+            self._migrate_log_file()
+
+    def _migrate_log_file(self):
+        """Import events from the legacy JSON log, unless already imported."""
+        try:
+            with dashboard_transaction() as conn:
+                if conn.execute(_LOG_MIGRATED_SQL, {'log_file': self.log_file.name}).first():
+                    return
+                with open(self.log_file, 'r') as f:
+                    events = json.load(f).get("events", [])
+                if events:
+                    conn.execute(_INSERT_FEED_EVENT_SQL, [self._to_row(e) for e in events])
+                conn.execute(_RECORD_MIGRATION_SQL, {
+                    'log_file': self.log_file.name,
+                    'migrated_at': datetime.now().isoformat()
+                })
+            logger.info(f"Migrated {len(events)} feed events from {self.log_file}")
+        except Exception as e:
+            logger.error(f"Error migrating feed event log: {e}")
+
+    def _load_events(self) -> list:
+        """Read all stored events as (epoch seconds, event) pairs, skipping unreadable rows."""
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(_ALL_FEED_EVENTS_SQL).fetchall()
+        except Exception as e:
+            logger.error(f"Error loading feed events: {e}")
+            return []
+        
+        events = []
+        for row in rows:
+            try:
+                events.append(self._from_row(row))
+            except (TypeError, ValueError) as e:
+                logger.error(f"Skipping unreadable feed event {tuple(row)}: {e}")
+        return events
+
+    @staticmethod
+    def _to_row(event: Dict) -> Dict:
+        """Convert an event dictionary to insert parameters."""
+        row = {column: event.get(column) for column in _FEED_EVENT_COLUMNS}
+        row['components'] = json.dumps(event.get('components') or {})
+        return row
 
-    def _initialize_log_file(self):
-        """Initialize an empty log file with proper structure."""
-        with open(self.log_file, 'w') as f:
-            json.dump({"events": []}, f, indent=4)
+    @staticmethod
+    def _from_row(row) -> Tuple[float, Dict]:
+        """Convert a feed_events row back to its time in epoch seconds and event dictionary."""
+        event = dict(zip(_FEED_EVENT_COLUMNS, row))
+        event['components'] = json.loads(event['components']) if event['components'] else {}
+        return datetime.fromisoformat(event['timestamp']).timestamp(), event
 
     def log_event(self, feed_type: str, volume: float, components: Dict[str, float],
                   operator: Optional[str] = None, notes: Optional[str] = None):
-        """Log a feed event with timestamp and details."""
+        """Log a feed event with timestamp and details.
+        
+        The event is visible to queries immediately. Its row is queued and
+        written, together with any others logged in the meantime, by a
+        single insert and commit FLUSH_INTERVAL seconds later, so callers
+        never wait on the disk. Call flush() to write pending events now
+        and learn whether the write succeeded.
+        """
+        now = datetime.now()
         event = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "feed_type": feed_type,
             "volume": volume,
             "components": components,
@@ -31,49 +181,88 @@ class FeedEventLogger:
             "notes": notes
         }
 
-        try:
-            with open(self.log_file, 'r') as f:
-                log_data = json.load(f)
-            
-            log_data["events"].append(event)
-            
-            with open(self.log_file, 'w') as f:
-                json.dump(log_data, f, indent=4)
-                
-            logger.info(f"Feed event logged successfully: {feed_type}")
-        except Exception as e:
-            logger.error(f"Error logging feed event: {e}")
-        self.events.append(event)
+        self._pending.append(self._to_row(event))
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        logger.debug(f"Feed event queued: {feed_type}")
+        with self._events_lock:
+            # Appends, unless the clock was set back since the last event
+            i = bisect_right(self._epochs, now.timestamp())
+            self._epochs.insert(i, now.timestamp())
+            self.events.insert(i, event)
+
+    def flush(self) -> bool:
+        """Write all queued events in one transaction.
+        
+        If the write fails, the rows are put back at the front of the queue
+        and written by the next flush.
+        
+        Returns:
+            True if nothing is left queued
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            rows = []
+            while self._pending:
+                rows.append(self._pending.popleft())
+            if not rows:
+                return True
+
+            try:
+                with dashboard_transaction() as conn:
+                    conn.execute(_INSERT_FEED_EVENT_SQL, rows)
+            except Exception as e:
+                self._pending.extendleft(reversed(rows))
+                logger.error(f"Error logging feed events, {len(rows)} kept queued for the next flush: {e}")
+                return False
+            for row in rows:
+                logger.info(f"Feed event logged successfully: {row['feed_type']}")
+            return True
 
-    def get_events(self, start_time: Optional[str] = None, 
+    def get_events(self, start_time: Optional[str] = None,
                   end_time: Optional[str] = None,
                   feed_type: Optional[str] = None) -> list:
-        """Retrieve feed events with optional filtering."""
+        """Retrieve feed events with optional filtering.
+        
+        The time range is located by binary search on the sorted event times,
+        so only events inside it are visited.
+        
+        Args:
+            start_time: Earliest timestamp to include, in ISO format
+            end_time: Latest timestamp to include, in ISO format
+            feed_type: Only include events of this feed type
+        """
         try:
-            with open(self.log_file, 'r') as f:
-                log_data = json.load(f)
-            
-            events = log_data["events"]
-            
-            if start_time:
-                events = [e for e in events if e["timestamp"] >= start_time]
-            if end_time:
-                events = [e for e in events if e["timestamp"] <= end_time]
-            if feed_type:
-                events = [e for e in events if e["feed_type"] == feed_type]
-                
-            return events
-        except Exception as e:
+            start = datetime.fromisoformat(start_time).timestamp() if start_time else None
+            end = datetime.fromisoformat(end_time).timestamp() if end_time else None
+        except (TypeError, ValueError) as e:
             logger.error(f"Error retrieving feed events: {e}")
             return []
+        with self._events_lock:
+            lo = bisect_left(self._epochs, start) if start is not None else 0
+            hi = bisect_right(self._epochs, end) if end is not None else len(self.events)
+            events = self.events[lo:hi]
+        return [dict(e) for e in events if not feed_type or e["feed_type"] == feed_type]
 
     def get_recent_events(self, hours: int = 24) -> list:
         """Get feed events from the last N hours."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        return [e for e in self.events if e['timestamp'] >= cutoff]
-        
+        cutoff = time.time() - hours * 3600
+        with self._events_lock:
+            events = self.events[bisect_left(self._epochs, cutoff):]
+        return [dict(e) for e in events]
+
     def get_latest_feed_event(self):
         """Get the most recent feed event."""
-        if not self.events:
-            return None
-        return max(self.events, key=lambda x: x['timestamp'])
+        # Events are kept sorted by time, so the latest is the last one
+        with self._events_lock:
+            return dict(self.events[-1]) if self.events else None
+        
+    def get_latest_event_time(self) -> Optional[float]:
+        """Get the time of the most recent feed event in epoch seconds, or None."""
+        with self._events_lock:
+            return self._epochs[-1] if self._epochs else None
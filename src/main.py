@@ -67,14 +67,14 @@ class BioreactorSystem:
         logger.info("Starting cleanup process...")
         try:
             if self.db and self.db.is_connected:
-                # Add cleanup for database if needed
-                pass
+                # Write any feed parameters still queued
+                self.db.flush()
             if self.metrics:
                 # Add cleanup for metrics if needed
                 pass
             if self.dashboard:
-                # Add cleanup for dashboard if needed
-                pass
+                # Write any feed events still queued
+                self.dashboard.feed_logger.flush()
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
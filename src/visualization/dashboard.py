@@ -6,10 +6,13 @@ from dash.dependencies import Input, Output, State, ALL
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 import json
 import jsonschema
 from pathlib import Path
 import logging
+import time
+import threading
 from datetime import datetime
 from data.feed_events import FeedEventLogger
 from analysis.feed_detection import FeedDetector
@@ -18,10 +21,87 @@ from data.database import DatabaseConnection
 from analysis.scientific_export import ScientificDataExporter, ScientificAnnotation
 from analysis.ai_insights import OllamaAnalyzer, MetricInsight
 import os
+from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick n_out points of a series with Largest-Triangle-Three-Buckets.
+    
+    The first and last points are kept. The points in between are split
+    into n_out - 2 buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average is kept. Unlike taking every k-th sample, this preserves peaks
+    and steps, e.g. a DO drop after a feed.
+    
+    Args:
+        x: Increasing sample positions (e.g. int64 nanosecond timestamps)
+        y: Sample values
+        n_out: Number of points to keep
+        
+    Returns:
+        Sorted indices of the kept points (all indices if len(x) <= n_out)
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # Relative float positions keep the area products well within range
+    x = (x - x[0]).astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    edges = np.append(edges, n)  # The last point is the final "next bucket"
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+# DO samples from the last 2 hours, for the oxygen metrics
+_RECENT_DO_SQL = text("""
+    SELECT DateTime, Reactor_1_DO_Value_PPM as do_value
+    FROM ReactorData
+    WHERE DateTime >= DATEADD(hour, -2, GETDATE())
+    ORDER BY DateTime DESC
+""")
+
+# Latest TSS value from manual inputs
+_LATEST_TSS_SQL = text("""
+    SELECT tss_value
+    FROM process_parameters
+    ORDER BY timestamp DESC
+    LIMIT 1
+""")
+
+# DO samples from the last 24 hours, for AI trend analysis
+_DO_HISTORY_SQL = text("""
+    SELECT DateTime as timestamp, Reactor_1_DO_Value_PPM as do_value
+    FROM ReactorData
+    WHERE DateTime >= DATEADD(hour, -24, GETDATE())
+    ORDER BY DateTime ASC
+""")
+
 class BioreactorDashboard:
+    # Lifetime (seconds) of computed callback results shared by all open
+    # dashboards, which each poll or click independently
+    METRICS_TTL = 5.0
+    AI_INSIGHTS_TTL = 5.0
+    # Most points sent to the browser per trace of the main graph; more
+    # samples than this cannot be told apart at the graph's width anyway
+    # (see _lttb_indices)
+    MAX_PLOT_POINTS = 1000
+
     def __init__(self, db: Optional[DatabaseConnection] = None):
         self.app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
         self.settings_file = Path("feed_settings.json")
@@ -37,16 +117,47 @@ class BioreactorDashboard:
         )
         self.db = db
         self.scientific_exporter = ScientificDataExporter()
-        self.ai_analyzer = OllamaAnalyzer()  # Will use env variables for configuration
+        # Created on first AI analysis (see ai_analyzer)
+        self._ai_analyzer: Optional[OllamaAnalyzer] = None
         self.latest_metrics = {
             "drop_rate": 0,
             "recovery_time": 0,
             "our": 0,
             "sour": 0
         }
+        self._cache: Dict[str, tuple] = {}
+        # Main plot figure, reused across updates (see create_main_plot)
+        self._main_figure: Optional[go.Figure] = None
+        self._main_plot_lock = threading.Lock()
+        # (data state, figure dict) of the last main graph built
+        self._main_plot: Optional[tuple] = None
+        # (input state, outputs) of the last oxygen metrics computed
+        self._oxygen_metrics: Optional[tuple] = None
         self.setup_layout()
         self.setup_callbacks()
         
+    @property
+    def ai_analyzer(self) -> OllamaAnalyzer:
+        """Ollama analyzer, created when an AI analysis is first requested.
+        
+        Construction opens an HTTP session and checks the model with Ollama,
+        which dashboard startup should not wait on.
+        """
+        if self._ai_analyzer is None:
+            self._ai_analyzer = OllamaAnalyzer()  # Will use env variables for configuration
+        return self._ai_analyzer
+
+    def _cache_get(self, key: str):
+        """Return a cached callback result if it has not expired, otherwise None."""
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _cache_put(self, key: str, value, ttl: float):
+        """Store a callback result for ttl seconds."""
+        self._cache[key] = (time.monotonic() + ttl, value)
+        
     def load_settings(self) -> Dict:
         """Load settings from JSON file or create with defaults."""
         schema_path = Path(__file__).parent.parent / "schemas" / "feed_settings_schema.json"
@@ -97,7 +208,8 @@ class BioreactorDashboard:
     def setup_layout(self):
         """Create the dashboard layout."""
         self.app.layout = dbc.Container([
-            # Add interval component for periodic updates
+            # Refreshes the oxygen metrics on the Monitoring tab; the main
+            # graph and feed detection run on the faster graph-update timer
             dcc.Interval(
                 id='interval-component',
                 interval=10000,
@@ -468,120 +580,239 @@ class BioreactorDashboard:
             ])
         ], fluid=True)
         
-    def create_main_plot(self, data: pd.DataFrame, feed_events: List[Dict] = None) -> go.Figure:
+    # Traces of the main plot, in order: (column, name, colour, x axis, y axis)
+    _MAIN_PLOT_TRACES = (
+        ('do_value', 'DO', 'blue', 'x', 'y'),
+        ('ph_value', 'pH', 'red', 'x2', 'y2'),
+        ('temperature', 'Temperature', 'orange', 'x2', 'y2'),
+        ('reactor_weight', 'Reactor Weight', 'green', 'x3', 'y3'),
+        ('feed_bottle_weight', 'Feed Bottle Weight', 'purple', 'x3', 'y3')
+    )
+
+    def _build_main_figure(self) -> go.Figure:
+        """Build the main plot's subplot layout and empty traces."""
+        fig = make_subplots(
+            rows=3, cols=1,
+            shared_xaxes=True,
+            subplot_titles=('Dissolved Oxygen', 'pH & Temperature', 'Weights'),
+            vertical_spacing=0.05
+        )
+        for column, name, color, xaxis, yaxis in self._MAIN_PLOT_TRACES:
+            fig.add_trace(go.Scattergl(x=np.empty(0), y=np.empty(0), name=name,
+                                       line=dict(color=color), xaxis=xaxis, yaxis=yaxis))
+        fig.update_layout(height=800, showlegend=True)
+        return fig
+
+    def create_main_plot(self, data: pd.DataFrame, feed_events: List[Dict] = None) -> Dict:
         """Create the main monitoring plot.
         
+        Traces are drawn with WebGL (Scattergl), which keeps rendering fast
+        for long windows where SVG scatter traces slow down. A private figure,
+        with its subplot layout and traces, is built once; each call only
+        replaces its trace data and feed markers and returns a snapshot of it.
+        
         Args:
             data: DataFrame with sensor data
             feed_events: List of feed event dictionaries
             
         Returns:
-            Plotly figure object
+            Plotly figure as a dictionary, owned by the caller
         """
-        fig = make_subplots(
-            rows=3, cols=1,
-            shared_xaxis=True,
-            subplot_titles=('Dissolved Oxygen', 'pH & Temperature', 'Weights'),
-            vertical_spacing=0.05
-        )
+        with self._main_plot_lock:
+            return self._render_main_figure(data, feed_events)
+    
+    def _render_main_figure(self, data: pd.DataFrame, feed_events: Optional[List[Dict]]) -> Dict:
+        """Update the shared main figure and return a copy; hold _main_plot_lock."""
+        if self._main_figure is None:
+            self._main_figure = self._build_main_figure()
+        fig = self._main_figure
         
-        # DO plot
-        fig.add_trace(
-            go.Scatter(x=data['timestamp'], y=data['do_value'],
-                      name='DO', line=dict(color='blue')),
-            row=1, col=1
-        )
+        # Contiguous NumPy columns rather than Series. Each trace is reduced
+        # to MAX_PLOT_POINTS with LTTB; the full-resolution data stays here.
+        x = data['timestamp'].to_numpy()
+        x_ns = x.astype('datetime64[ns]').astype(np.int64)
+        with fig.batch_update():
+            for trace, (column, *_) in zip(fig.data, self._MAIN_PLOT_TRACES):
+                y = data[column].to_numpy(dtype=np.float64)
+                keep = _lttb_indices(x_ns, y, self.MAX_PLOT_POINTS)
+                trace.x = x[keep]
+                trace.y = y[keep]
+            
+            # Add feed events if provided, as a vertical line across each subplot
+            fig.layout.shapes = [
+                dict(
+                    type='line',
+                    x0=event['timestamp'], x1=event['timestamp'],
+                    xref=axis, y0=0, y1=1, yref=f'{axis.replace("x", "y")} domain',
+                    line=dict(dash='dash', color='gray')
+                )
+                for event in feed_events or ()
+                for axis in ('x', 'x2', 'x3')
+            ]
         
-        # pH and Temperature
-        fig.add_trace(
-            go.Scatter(x=data['timestamp'], y=data['ph_value'],
-                      name='pH', line=dict(color='red')),
-            row=2, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=data['timestamp'], y=data['temperature'],
-                      name='Temperature', line=dict(color='orange')),
-            row=2, col=1
-        )
+        return fig.to_dict()
+    
+    def _compute_oxygen_metrics(self):
+        """Compute the formatted DO saturation, drop rate, recovery, OUR and sOUR outputs."""
+        try:
+            # Get the latest DO data and the latest TSS value from manual inputs
+            do_data, tss_df = self.db.run_concurrently(
+                lambda: pd.read_sql(_RECENT_DO_SQL, self.db.reactor_engine, parse_dates=['DateTime']),
+                lambda: pd.read_sql(_LATEST_TSS_SQL, self.db.dashboard_engine)
+            )
+            
+            # Rename DateTime column to timestamp for consistency
+            do_data = do_data.rename(columns={'DateTime': 'timestamp'})
+            
+            # Get the latest feed event
+            latest_feed = self.feed_logger.get_latest_feed_event()
+            biomass_concentration = tss_df['tss_value'].iat[0] if not tss_df.empty else None
+            
+            # Skip recomputing when neither the DO window, the feed event nor
+            # the TSS value has changed since the last computation
+            key = (
+                len(do_data),
+                do_data['timestamp'].iat[0] if not do_data.empty else None,
+                latest_feed['timestamp'] if latest_feed is not None else None,
+                biomass_concentration
+            )
+            if self._oxygen_metrics is not None and self._oxygen_metrics[0] == key:
+                return self._oxygen_metrics[1]
+            outputs = self._oxygen_metrics_outputs(do_data, latest_feed, biomass_concentration)
+            self._oxygen_metrics = (key, outputs)
+            return outputs
+            
+        except Exception as e:
+            logger.error(f"Error updating oxygen metrics: {e}")
+            self.latest_metrics = {k: 0 for k in self.latest_metrics}
+            return "Error", "Error", "Error", "Error", "Error"
+
+    def _oxygen_metrics_outputs(self, do_data: pd.DataFrame, latest_feed: Optional[Dict],
+                                biomass_concentration: Optional[float]) -> tuple:
+        """Calculate the oxygen metrics for a DO window and format them for display."""
+        # Update DO saturation based on recent data
+        self.metrics.update_do_saturation(do_data)
         
-        # Weights
-        fig.add_trace(
-            go.Scatter(x=data['timestamp'], y=data['reactor_weight'],
-                      name='Reactor Weight', line=dict(color='green')),
-            row=3, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=data['timestamp'], y=data['feed_bottle_weight'],
-                      name='Feed Bottle Weight', line=dict(color='purple')),
-            row=3, col=1
+        if self.metrics.do_saturation is None:
+            logger.warning("Could not determine DO saturation from data")
+            return "No stable DO", "No data", "No data", "No data", "No data"
+        
+        if latest_feed is None:
+            return (f"{self.metrics.do_saturation:.2f} mg/L", 
+                   "No data", "No data", "No data", "No data")
+        
+        # Calculate metrics; one drop-rate fit serves the drop rate, OUR and sOUR
+        event_time = pd.Timestamp(latest_feed['timestamp'])
+        response = self.metrics.calculate_do_response_metrics(
+            do_data, event_time, biomass_concentration or None
         )
+        drop_rate = response['do_drop_rate']
+        r_squared = response['do_drop_r_squared']
+        recovery_time = response['recovery_time']
+        our = response['our']
+        sour = response['sour']
         
-        # Add feed events if provided
-        if feed_events:
-            for event in feed_events:
-                for i in range(1, 4):
-                    fig.add_vline(
-                        x=event['timestamp'],
-                        line_dash="dash",
-                        line_color="gray",
-                        row=i, col=1
-                    )
+        # Update latest metrics
+        self.latest_metrics.update({
+            "drop_rate": drop_rate if drop_rate else 0,
+            "recovery_time": recovery_time if recovery_time else 0,
+            "our": our if our else 0,
+            "sour": sour if sour else 0
+        })
         
-        fig.update_layout(height=800, showlegend=True)
-        return fig
-    
+        # Format output strings
+        saturation_str = f"{self.metrics.do_saturation:.2f} mg/L"
+        drop_rate_str = f"{abs(drop_rate):.3f} mg/L/s (R² = {r_squared:.2f})" if drop_rate else "No data"
+        recovery_str = f"{recovery_time:.1f} s" if recovery_time else "Not recovered"
+        our_str = f"{our:.2f} mg O₂/L/h" if our else "No data"
+        sour_str = f"{sour:.2f} mg O₂/g/h" if sour else "No data"
+        
+        return saturation_str, drop_rate_str, recovery_str, our_str, sour_str
+
+    def _update_main_plot(self, data: pd.DataFrame, recent_events: List[Dict],
+                          latest_event_time: Optional[float]):
+        """Build the main graph figure for the latest data and feed events."""
+        try:
+            if not data.empty:
+                # Reuse the last figure while its inputs are unchanged
+                # (the data is cached between polls, and every open
+                # dashboard polls on its own timer). The event time is read
+                # before the events, so an event logged in between only
+                # causes one extra rebuild.
+                key = (len(data), data['timestamp'].iat[-1], latest_event_time)
+                if self._main_plot is not None and self._main_plot[0] == key:
+                    return self._main_plot[1]
+                
+                # Rename columns for plot
+                plot_data = data.rename(columns={
+                    'DateTime': 'timestamp',
+                    'Reactor_1_DO_Value_PPM': 'do_value',
+                    'Reactor_1_PH_Value': 'ph_value',
+                    'Reactor_1_DO_T_Value': 'temperature',
+                    'R1_Weight_Bal': 'reactor_weight',
+                    'R2_Weight_Bal': 'feed_bottle_weight'
+                })
+                figure = self.create_main_plot(plot_data, recent_events)
+                self._main_plot = (key, figure)
+                return figure
+        except Exception as e:
+            logger.error(f"Error updating graph: {e}")
+        
+        # Return empty figure if there's an error or no data
+        return make_subplots(specs=[[{"secondary_y": True}]])
+
     def setup_callbacks(self):
         """Setup Dash callbacks for interactivity."""
         @self.app.callback(
             [Output('current-metrics', 'children'),
-             Output('auto-feed-status', 'children')],
+             Output('auto-feed-status', 'children'),
+             Output('main-graph', 'figure')],
             [Input('graph-update', 'n_intervals')]
         )
-        def update_metrics_and_detect_feeds(n):
+        def update_monitoring(n):
+            # One tick fetches the 30-minute window once; feed detection uses
+            # its last 5 minutes and the graph uses all of it
+            data = pd.DataFrame()
+            recent_events = []
+            latest_event_time = None
+            metrics_output = (
+                html.Div("No data available"),
+                html.Div("Feed detection unavailable", className="text-muted")
+            )
             try:
-                db = DatabaseConnection()
-                with db:
-                    current_data = db.get_latest_data(minutes=5)
+                if self.db is not None:
+                    # The reactor query and the feed log read are independent
+                    latest_event_time = self.feed_logger.get_latest_event_time()
+                    data, recent_events = self.db.run_concurrently(
+                        lambda: self.db.get_latest_data(minutes=30),
+                        self.feed_logger.get_recent_events
+                    )
                 
-                    if not current_data.empty and 'timestamp' in current_data.columns:
-                        # Detect feed events and automatically log them
+                    if not data.empty and 'timestamp' in data.columns:
+                        # Detect feed events and automatically log them. The
+                        # window ends at the newest reading, which uses the
+                        # database server's clock, not this host's.
+                        current_data = data[
+                            data['timestamp'] >= data['timestamp'].max() - pd.Timedelta(minutes=5)
+                        ]
                         detected_events = self.feed_detector.detect_feed_events(
                             current_data, 
                             feed_logger=self.feed_logger
                         )
-                        
-                    
-                    return html.Div("No data available"), html.Div("Feed detection unavailable", className="text-muted")
+                        if detected_events:
+                            # Show this tick's detections on this tick's graph
+                            latest_event_time = self.feed_logger.get_latest_event_time()
+                            recent_events = self.feed_logger.get_recent_events()
                     
             except Exception as e:
                 logger.error(f"Error updating metrics and detecting feeds: {e}")
-                return html.Div(f"Error: {str(e)}"), html.Div("Feed detection error", className="text-danger")
-
-        @self.app.callback(
-            Output('main-graph', 'figure'),
-            [Input('graph-update', 'n_intervals')]
-        )
-        def update_graph(n):
-            try:
-                with self.db:
-                    data = self.db.get_latest_data(minutes=30)
-                    if not data.empty:
-                        # Rename columns for plot
-                        plot_data = data.rename(columns={
-                            'DateTime': 'timestamp',
-                            'Reactor_1_DO_Value_PPM': 'do_value',
-                            'Reactor_1_PH_Value': 'ph_value',
-                            'Reactor_1_DO_T_Value': 'temperature',
-                            'R1_Weight_Bal': 'reactor_weight',
-                            'R2_Weight_Bal': 'feed_bottle_weight'
-                        })
-                        recent_events = self.feed_logger.get_recent_events()
-                        return self.create_main_plot(plot_data, recent_events)
-            except Exception as e:
-                logger.error(f"Error updating graph: {e}")
+                metrics_output = (
+                    html.Div(f"Error: {str(e)}"),
+                    html.Div("Feed detection error", className="text-danger")
+                )
             
-            # Return empty figure if there's an error or no data
-            return make_subplots(specs=[[{"secondary_y": True}]])
+            return (*metrics_output,
+                    self._update_main_plot(data, recent_events, latest_event_time))
             
         @self.app.callback(
             Output("feed-status", "children"),
@@ -669,72 +900,13 @@ class BioreactorDashboard:
             [Input("interval-component", "n_intervals")]
         )
         def update_oxygen_metrics(n):
-            try:
-                # Get the latest DO data from the database
-                query = """
-                    SELECT DateTime, Reactor_1_DO_Value_PPM as do_value 
-                    FROM ReactorData 
-                    WHERE DateTime >= DATEADD(hour, -2, GETDATE())
-                    ORDER BY DateTime DESC
-                """
-                do_data = pd.read_sql(query, self.db.reactor_engine)
-                
-                # Rename DateTime column to timestamp for consistency
-                do_data = do_data.rename(columns={'DateTime': 'timestamp'})
-                
-                # Rest of the function remains the same
-                # Update DO saturation based on recent data
-                self.metrics.update_do_saturation(do_data)
-                
-                if self.metrics.do_saturation is None:
-                    logger.warning("Could not determine DO saturation from data")
-                    return "No stable DO", "No data", "No data", "No data", "No data"
-                
-                # Get the latest feed event
-                latest_feed = self.feed_logger.get_latest_feed_event()
-                
-                if latest_feed is None:
-                    return (f"{self.metrics.do_saturation:.2f} mg/L", 
-                           "No data", "No data", "No data", "No data")
-                
-                # Get the latest TSS value from manual inputs
-                tss_query = """
-                    SELECT tss_value 
-                    FROM process_parameters 
-                    ORDER BY timestamp DESC 
-                    LIMIT 1
-                """
-                tss_df = pd.read_sql(tss_query, self.db.dashboard_engine)
-                biomass_concentration = tss_df['tss_value'].iloc[0] if not tss_df.empty else None
-                
-                # Calculate metrics
-                event_time = pd.Timestamp(latest_feed['timestamp'])
-                drop_rate, r_squared = self.metrics.calculate_do_drop_rate(do_data, event_time)
-                recovery_time = self.metrics.calculate_recovery_time(do_data, event_time)
-                our = self.metrics.calculate_our(do_data, event_time)
-                sour = self.metrics.calculate_sour(do_data, event_time, biomass_concentration) if biomass_concentration else None
-                
-                # Update latest metrics
-                self.latest_metrics.update({
-                    "drop_rate": drop_rate if drop_rate else 0,
-                    "recovery_time": recovery_time if recovery_time else 0,
-                    "our": our if our else 0,
-                    "sour": sour if sour else 0
-                })
-                
-                # Format output strings
-                saturation_str = f"{self.metrics.do_saturation:.2f} mg/L"
-                drop_rate_str = f"{abs(drop_rate):.3f} mg/L/s (R² = {r_squared:.2f})" if drop_rate else "No data"
-                recovery_str = f"{recovery_time:.1f} s" if recovery_time else "Not recovered"
-                our_str = f"{our:.2f} mg O₂/L/h" if our else "No data"
-                sour_str = f"{sour:.2f} mg O₂/g/h" if sour else "No data"
-                
-                return saturation_str, drop_rate_str, recovery_str, our_str, sour_str
-                
-            except Exception as e:
-                logger.error(f"Error updating oxygen metrics: {e}")
-                self.latest_metrics = {k: 0 for k in self.latest_metrics}
-                return "Error", "Error", "Error", "Error", "Error"
+            # Every open dashboard polls on its own timer; share one computation
+            cached = self._cache_get('oxygen_metrics')
+            if cached is not None:
+                return cached
+            outputs = self._compute_oxygen_metrics()
+            self._cache_put('oxygen_metrics', outputs, self.METRICS_TTL)
+            return outputs
         
         @self.app.callback(
             Output("export-preview", "children"),
@@ -834,40 +1006,40 @@ class BioreactorDashboard:
                 return ""
                 
             try:
-                # Get current metrics and historical data
-                current_metrics = {
-                    "DO Saturation": self.metrics.do_saturation,
-                    "DO Drop Rate": self.latest_metrics.get("drop_rate", 0),
-                    "DO Recovery Time": self.latest_metrics.get("recovery_time", 0),
-                    "OUR": self.latest_metrics.get("our", 0),
-                    "sOUR": self.latest_metrics.get("sour", 0)
-                }
-                
-                # Get historical data for trend analysis
-                query = """
-                    SELECT DateTime as timestamp, Reactor_1_DO_Value_PPM as do_value 
-                    FROM ReactorData 
-                    WHERE DateTime >= DATEADD(hour, -24, GETDATE())
-                    ORDER BY DateTime ASC
-                """
-                historical_data = pd.read_sql(query, self.db.reactor_engine)
-                
-                # Get current conditions
-                conditions = {
-                    "Temperature": "25°C",
-                    "pH": "7.0",
-                    "Feed Type": self.feed_logger.get_latest_feed_event().get("feed_type", "Unknown")
-                }
-                
-                # Generate AI insights
-                insights = self.ai_analyzer.analyze_metrics(
-                    current_metrics,
-                    historical_data,
-                    conditions
-                )
-                
-                # Generate scientific text
-                scientific_text = self.ai_analyzer.generate_scientific_text(insights)
+                cached = self._cache_get('ai_insights')
+                if cached is not None:
+                    insights, scientific_text = cached
+                else:
+                    # Get current metrics and historical data
+                    current_metrics = {
+                        "DO Saturation": self.metrics.do_saturation,
+                        "DO Drop Rate": self.latest_metrics.get("drop_rate", 0),
+                        "DO Recovery Time": self.latest_metrics.get("recovery_time", 0),
+                        "OUR": self.latest_metrics.get("our", 0),
+                        "sOUR": self.latest_metrics.get("sour", 0)
+                    }
+                    
+                    # Get historical data for trend analysis
+                    historical_data = pd.read_sql(_DO_HISTORY_SQL, self.db.reactor_engine,
+                                                  parse_dates=['timestamp'])
+                    
+                    # Get current conditions
+                    conditions = {
+                        "Temperature": "25°C",
+                        "pH": "7.0",
+                        "Feed Type": self.feed_logger.get_latest_feed_event().get("feed_type", "Unknown")
+                    }
+                    
+                    # Generate AI insights
+                    insights = self.ai_analyzer.analyze_metrics(
+                        current_metrics,
+                        historical_data,
+                        conditions
+                    )
+                    
+                    # Generate scientific text
+                    scientific_text = self.ai_analyzer.generate_scientific_text(insights)
+                    self._cache_put('ai_insights', (insights, scientific_text), self.AI_INSIGHTS_TTL)
                 
                 # Format output based on selected format
                 if format_type == "latex":